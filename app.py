@@ -9,11 +9,13 @@ Dashboard aggregates both to RA level and displays all metrics.
 """
 
 import os
+import re
 import json
 import socket
 from datetime import datetime
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 import plotly.express as px
@@ -94,7 +96,12 @@ def get_db_connection_str() -> str:
     except Exception:
         pass
     
-    default_conn = "mysql+mysqlconnector://root@127.0.0.1/fd_production"
+    # Prefer the mysqlclient C driver (much faster row fetching) when it is installed
+    try:
+        import MySQLdb  # noqa: F401
+        default_conn = "mysql+mysqldb://root@127.0.0.1/fd_production?charset=utf8mb4"
+    except ImportError:
+        default_conn = "mysql+mysqlconnector://root@127.0.0.1/fd_production"
     if _is_port_open("127.0.0.1", 3306):
         return default_conn
     return ""
@@ -119,6 +126,14 @@ def _is_db_reachable() -> bool:
 
 DB_REFRESH_ENABLED = DB_AVAILABLE and _is_db_reachable()
 
+
+@st.cache_resource(show_spinner=False)
+def get_engine():
+    """Shared SQLAlchemy engine; its connection pool is reused across queries and reruns."""
+    # pre_ping revalidates pooled connections that MySQL dropped while the app sat idle
+    return create_engine(DB_CONNECTION_STR, pool_size=2, max_overflow=2,
+                         pool_recycle=1800, pool_pre_ping=True)
+
 # RAs to exclude from dashboard (e.g., PI, supervisors)
 EXCLUDED_RAS = ['julie', 'cate']
 
@@ -142,6 +157,36 @@ RUBRIC = {
     "team": {"title": "Team Participation", "automated": False}
 }
 
+# Manual score options with descriptions (admin entry form)
+SCORE_VALUES = [0, 1, 2, 3, 4, 5]
+
+JOURNAL_SCORE_OPTIONS = {
+    0: "0 - Not Rated",
+    1: "1 - Missing/Very Little",
+    2: "2 - Not Good",
+    3: "3 - Basic Minimum",
+    4: "4 - Good",
+    5: "5 - Outstanding"
+}
+
+FEEDBACK_SCORE_OPTIONS = {
+    0: "0 - Not Rated",
+    1: "1 - Very Poor",
+    2: "2 - Low Effort",
+    3: "3 - Some Effort",
+    4: "4 - Most Checks Done",
+    5: "5 - All Checks Done"
+}
+
+TEAM_SCORE_OPTIONS = {
+    0: "0 - Not Rated",
+    1: "1 - Very Poor",
+    2: "2 - Minimal",
+    3: "3 - Some Contribution",
+    4: "4 - Good Contribution",
+    5: "5 - Led Discussion/Active"
+}
+
 # Issue Category Definitions - Clear explanations for dashboard users
 ISSUE_CATEGORY_DEFINITIONS = {
     "Unlinked Transactions": {
@@ -186,6 +231,31 @@ ISSUE_CATEGORY_DEFINITIONS = {
     }
 }
 
+# Ordered (category, regex) rules for the issues tab; the first matching rule wins
+ISSUE_CATEGORY_PATTERNS = [
+    ("Unlinked Transactions", r"not linked|unlinked|linking"),
+    ("Sources/Uses Imbalance", r"imbalance|source.*use|use.*source"),
+    ("Cash Balance Missing", r"cash on hand|cash-on-hand"),
+    ("In-Kind Recording Issues", r"in-kind|in kind"),
+    ("Outdated Transactions", r"21 days|old"),
+    ("Health Record Issues", r"medicine|health"),
+    ("Pregnancy Tracking Issues", r"pregnancy"),
+    ("Missing Forms/Updates", r"update|form"),
+    ("Unlinked Transactions", r"mpesa|m-pesa|credit|shop"),
+]
+
+# Narrower keyword set used for the month-over-month quality trend
+TREND_ISSUE_CATEGORY_PATTERNS = [
+    ("Unlinked Transactions", r"not linked|unlinked"),
+    ("Sources/Uses Imbalance", r"imbalance"),
+    ("Cash Balance Missing", r"cash on hand"),
+    ("In-Kind Recording Issues", r"in-kind"),
+    ("Outdated Transactions", r"21 days"),
+    ("Health Record Issues", r"medicine|health"),
+    ("Pregnancy Tracking Issues", r"pregnancy"),
+    ("Unlinked Transactions", r"m-pesa|mpesa"),  # M-Pesa falls under linking
+]
+
 # Quality Issues Reference (detailed codes)
 QUALITY_ISSUES = {
     "Cashflow Issues (CF)": [
@@ -248,27 +318,46 @@ def get_date_range(month: int, year: int):
     return start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")
 
 
+@st.cache_data(ttl=600, show_spinner=False)
+def _query_sql_file(sql_path: str, mtime: float, start_date: str, end_date: str) -> pd.DataFrame:
+    """
+    Execute a SQL script for a date range (cached; no Streamlit output here).
+    mtime is only part of the cache key, so editing the .sql file busts the cache.
+    """
+    with open(sql_path, 'r', encoding='utf-8') as f:
+        sql = f.read()
+    
+    # Turn the scripts' @start_date/@end_date session variables into bind
+    # parameters so dates are never spliced into the SQL text
+    sql = sql.replace('@start_date', ':start_date')
+    sql = sql.replace('@end_date', ':end_date')
+    
+    engine = get_engine()
+    # stream_results asks for an unbuffered server-side cursor so only one chunk
+    # of rows sits in memory at a time (drivers without support fall back silently)
+    with engine.connect().execution_options(stream_results=True) as conn:
+        # Read in chunks into Arrow-backed dtypes so text columns aren't held as Python objects
+        return pd.concat(
+            pd.read_sql(text(sql), conn, params={'start_date': start_date, 'end_date': end_date},
+                        chunksize=10000, dtype_backend="pyarrow"),
+            ignore_index=True
+        )
+
+
 def run_sql_file(sql_path: Path, start_date: str, end_date: str, label: str = "") -> pd.DataFrame:
     """Read and execute a SQL file with date parameters."""
-    if not sql_path.exists():
+    try:
+        mtime = sql_path.stat().st_mtime
+    except FileNotFoundError:
         st.error(f"SQL file not found: {sql_path}")
         return pd.DataFrame()
     
-    with open(sql_path, 'r', encoding='utf-8') as f:
-        sql = f.read()
-    
-    # Replace date parameters
-    sql = sql.replace('@start_date', f"'{start_date}'")
-    sql = sql.replace('@end_date', f"'{end_date}'")
-    
     if not DB_REFRESH_ENABLED:
         st.sidebar.warning("Database refresh is disabled. Configure DB_CONN in secrets or environment to enable.")
         return pd.DataFrame()
     
     try:
-        engine = create_engine(DB_CONNECTION_STR)
-        with engine.connect() as conn:
-            df = pd.read_sql(text(sql), conn)
+        df = _query_sql_file(str(sql_path), mtime, start_date, end_date)
         st.sidebar.success(f"✅ {label}: {len(df)} rows")
         return df
     except Exception as e:
@@ -276,26 +365,95 @@ def run_sql_file(sql_path: Path, start_date: str, end_date: str, label: str = ""
         return pd.DataFrame()
 
 
+def read_query(engine, sql: str, params: dict) -> pd.DataFrame:
+    """Run a query with bind parameters on a pooled connection."""
+    with engine.connect() as conn:
+        return pd.read_sql(text(sql), conn, params=params)
+
+
+# Single-character replacements for normalize_columns ('%%' is handled first)
+_COLUMN_CHAR_MAP = str.maketrans({'%': 'pct', '<': 'lt', '>': 'gt', ' ': '_', '-': '_', "'": ''})
+_UNDERSCORE_RUN_RE = re.compile(r'_{2,}')
+
+
 def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
     """Normalize column names to snake_case."""
-    new_cols = []
-    for c in df.columns:
-        c = str(c).lower()
-        c = c.replace('%%', 'pct')
-        c = c.replace('%', 'pct')
-        c = c.replace('<', 'lt')
-        c = c.replace('>', 'gt')
-        c = c.replace(' ', '_')
-        c = c.replace('-', '_')
-        c = c.replace("'", "")
-        while '__' in c:
-            c = c.replace('__', '_')
-        c = c.strip('_')
-        new_cols.append(c)
-    df.columns = new_cols
+    df.columns = [
+        _UNDERSCORE_RUN_RE.sub('_', str(c).lower().replace('%%', 'pct').translate(_COLUMN_CHAR_MAP)).strip('_')
+        for c in df.columns
+    ]
     return df
 
 
+# Supplemental per-RA stats for fetch_all_metrics, in one pass over the month's
+# interviews. Dates are bind parameters (:start_date / :end_date) so the statement
+# text is identical across refreshes. Cashflows and answers are counted per interview
+# with index-backed subqueries (joining both tables would multiply rows).
+# gap_days comes from LAG over each household's interviews up to the end date, so the
+# previous interview is found even when it falls before the selected month.
+RA_STATS_QUERY = """
+WITH interview_gaps AS (
+    SELECT 
+        i.id AS interview_id,
+        i.interviewer_id,
+        i.interview_start_date,
+        DATEDIFF(i.interview_start_date,
+            LAG(i.interview_start_date) OVER (
+                PARTITION BY i.household_id
+                ORDER BY i.interview_start_date)
+        ) AS gap_days
+    FROM interviews i
+    JOIN households h ON h.id = i.household_id
+    WHERE h.project_id = 129
+      AND h.status = 1
+      AND h.out = 0
+      AND i.status = 1
+      AND DATE(i.interview_start_date) <= :end_date
+      AND h.name NOT LIKE '%test%'
+)
+SELECT 
+    cu.username AS ra_name,
+    SUM(per_interview.n_cfs) AS total_cfs,
+    SUM(per_interview.n_answers) AS total_answers,
+    SUM(CASE 
+        WHEN per_interview.gap_days BETWEEN 14 AND 16 THEN 1 
+        ELSE 0 
+    END) AS on_schedule,
+    COUNT(per_interview.gap_days) AS total_with_gap
+FROM (
+    SELECT 
+        g.interviewer_id,
+        (SELECT COUNT(*) 
+         FROM cashflows cf 
+         WHERE cf.interview_id = g.interview_id 
+           AND cf.status = 1) AS n_cfs,
+        (SELECT COUNT(*) 
+         FROM answers a 
+         WHERE a.interview_id = g.interview_id) AS n_answers,
+        g.gap_days
+    FROM interview_gaps g
+    WHERE g.interviewer_id IS NOT NULL
+      AND DATE(g.interview_start_date) BETWEEN :start_date AND :end_date
+) per_interview
+LEFT JOIN core_users cu ON cu.id = per_interview.interviewer_id
+GROUP BY cu.username
+"""
+
+
+def find_col(columns: list, *needles: str) -> 'str | None':
+    """Return the first (already normalized) column name containing every needle."""
+    for c in columns:
+        if all(n in c for n in needles):
+            return c
+    return None
+
+
+def percent(part: pd.Series, whole: pd.Series) -> np.ndarray:
+    """Whole-number percentage part/whole, computed on the raw arrays (0 where whole is 0)."""
+    whole = whole.to_numpy(dtype=np.float64)
+    return np.rint(part.to_numpy(dtype=np.float64) * 100.0 / np.maximum(whole, 1)).astype(np.int64)
+
+
 def fetch_all_metrics(start_date: str, end_date: str) -> pd.DataFrame:
     """
     Run both SQL scripts and aggregate to RA level.
@@ -330,21 +488,26 @@ def fetch_all_metrics(start_date: str, end_date: str) -> pd.DataFrame:
     st.sidebar.info(f"📋 Total interview rows: {len(completion_df)}")
     
     # Find RA column
-    ra_col = next((c for c in completion_df.columns if 'interviewer' in c.lower()), None)
-    if not ra_col:
-        ra_col = next((c for c in completion_df.columns if 'ra' in c.lower()), None)
+    cols = list(completion_df.columns)
+    ra_col = find_col(cols, 'interviewer') or find_col(cols, 'ra')
     if not ra_col:
         st.error(f"Could not find RA column. Columns: {list(completion_df.columns)}")
         return pd.DataFrame()
     
-    # Exclude non-RA users (PI, supervisors)
-    completion_df = completion_df[~completion_df[ra_col].str.lower().isin(EXCLUDED_RAS)]
-    
     # Find status column
-    status_col = next((c for c in completion_df.columns if c == 'status'), None)
+    status_col = 'status' if 'status' in cols else None
     
     # Find household column for counting
-    hh_col = next((c for c in completion_df.columns if 'household' in c.lower() and 'code' in c.lower()), None)
+    hh_col = find_col(cols, 'household', 'code')
+    
+    # Keep only the columns the aggregation uses. RA and status hold a handful of
+    # distinct values: as categoricals, the filters and groupbys below work on small
+    # integer codes instead of hashing strings
+    keep = list(dict.fromkeys(c for c in (ra_col, status_col, hh_col) if c))
+    completion_df = completion_df[keep].astype({c: 'category' for c in (ra_col, status_col) if c})
+    
+    # Exclude non-RA users (PI, supervisors)
+    completion_df = completion_df[~completion_df[ra_col].str.lower().isin(EXCLUDED_RAS)]
     
     # Debug: Show unique RAs
     unique_ras = completion_df[ra_col].nunique()
@@ -352,16 +515,19 @@ def fetch_all_metrics(start_date: str, end_date: str) -> pd.DataFrame:
     
     # Aggregate completion by RA
     if status_col:
-        completion_agg = completion_df.groupby(ra_col).agg(
+        # Precompute the flag so the groupby sums a column instead of calling a lambda per RA
+        completion_df = completion_df.assign(_is_complete=completion_df[status_col].eq('Complete'))
+        completion_agg = completion_df.groupby(ra_col, observed=True).agg(
             total_interviews=(hh_col if hh_col else ra_col, 'count'),
-            complete_count=(status_col, lambda x: (x == 'Complete').sum())
+            complete_count=('_is_complete', 'sum')
         ).reset_index()
-        completion_agg['pct_complete'] = (completion_agg['complete_count'] / completion_agg['total_interviews'] * 100).round(0).astype(int)
+        completion_agg['pct_complete'] = percent(completion_agg['complete_count'], completion_agg['total_interviews'])
     else:
-        completion_agg = completion_df.groupby(ra_col).size().reset_index(name='total_interviews')
+        completion_agg = completion_df.groupby(ra_col, observed=True).size().reset_index(name='total_interviews')
         completion_agg['pct_complete'] = 0
     
     completion_agg = completion_agg.rename(columns={ra_col: 'ra_name'})
+    completion_agg['ra_name'] = completion_agg['ra_name'].astype(str)
     
     # Run quality checks
     st.sidebar.info("📄 Running quality checks...")
@@ -371,58 +537,67 @@ def fetch_all_metrics(start_date: str, end_date: str) -> pd.DataFrame:
         quality_df = normalize_columns(quality_df)
         
         # Find RA column in quality
-        ra_col_q = next((c for c in quality_df.columns if 'ra' in c.lower()), None)
-        hh_col_q = next((c for c in quality_df.columns if 'household' in c.lower() and 'code' in c.lower()), None)
-        issue_col = next((c for c in quality_df.columns if 'issue' in c.lower() and 'desc' in c.lower()), None)
+        cols_q = list(quality_df.columns)
+        ra_col_q = find_col(cols_q, 'ra')
+        hh_col_q = find_col(cols_q, 'household', 'code')
+        issue_col = find_col(cols_q, 'issue', 'desc')
         
         # Find interview datetime column for proper counting
-        int_date_col = next((c for c in quality_df.columns if 'interview' in c.lower() and 'date' in c.lower()), None)
+        int_date_col = find_col(cols_q, 'interview', 'date')
         
         st.sidebar.info(f"🔍 Quality issue rows: {len(quality_df)}")
         
         if ra_col_q and hh_col_q:
+            keep = list(dict.fromkeys(c for c in (ra_col_q, hh_col_q, issue_col, int_date_col) if c))
+            quality_df = quality_df[keep].astype({c: 'category' for c in (ra_col_q, issue_col) if c})
+            
             # Create unique interview identifier (household_code + interview_datetime)
             # This ensures we count EACH interview, not just households
             if int_date_col:
-                quality_df['interview_key'] = quality_df[hh_col_q].astype(str) + '_' + quality_df[int_date_col].astype(str)
+                # Integer id per (household, date) pair; cheaper to build and count than a string key
+                quality_df['interview_key'] = quality_df.groupby([hh_col_q, int_date_col], sort=False, dropna=False).ngroup()
                 count_col = 'interview_key'
                 st.sidebar.info(f"🔑 Counting unique: household + date")
             else:
                 count_col = hh_col_q
                 st.sidebar.info(f"⚠️ Fallback: counting by household only")
             
-            # Count unique INTERVIEWS with issues per RA
-            issues_per_ra = quality_df.groupby(ra_col_q)[count_col].nunique().reset_index(name='interviews_with_issues')
-            issues_per_ra = issues_per_ra.rename(columns={ra_col_q: 'ra_name'})
+            # Flag CF02 (<5% imbalance) rows, matching against the ~30 distinct
+            # descriptions rather than every row
+            if issue_col:
+                categories = quality_df[issue_col].cat.categories
+                imbalance_descs = categories[categories.astype(str).str.contains('imbalance', case=False)]
+                is_imbalance = quality_df[issue_col].isin(imbalance_descs)
+            else:
+                is_imbalance = pd.Series(False, index=quality_df.index)
+            
+            # One pass: collapse rows to unique INTERVIEWS per RA (flagging any imbalance
+            # issue), then count interviews with issues / with imbalance per RA
+            per_interview = is_imbalance.groupby(
+                [quality_df[ra_col_q], quality_df[count_col]], observed=True, sort=False).any()
+            issues_per_ra = per_interview.groupby(level=0, observed=True).agg(['size', 'sum'])
+            issues_per_ra.columns = ['interviews_with_issues', 'interviews_with_imbalance']
+            issues_per_ra = issues_per_ra.rename_axis('ra_name').reset_index()
+            issues_per_ra['ra_name'] = issues_per_ra['ra_name'].astype(str)
             
             # Total unique interviews with any issue
             total_interviews_with_issues = quality_df[count_col].nunique()
             st.sidebar.info(f"❌ Total interviews with issues: {total_interviews_with_issues}")
             
-            # Calculate % with <5% imbalance from CF02 issues
-            if issue_col:
-                cf02_issues = quality_df[quality_df[issue_col].str.contains('imbalance', case=False, na=False)]
-                cf02_per_ra = cf02_issues.groupby(ra_col_q)[count_col].nunique().reset_index(name='interviews_with_imbalance')
-                cf02_per_ra = cf02_per_ra.rename(columns={ra_col_q: 'ra_name'})
-            else:
-                cf02_per_ra = pd.DataFrame({'ra_name': completion_agg['ra_name'], 'interviews_with_imbalance': 0})
-            
             # Merge with completion data
             result = completion_agg.merge(issues_per_ra, on='ra_name', how='left')
             result['interviews_with_issues'] = result['interviews_with_issues'].fillna(0).astype(int)
+            result['interviews_with_imbalance'] = result['interviews_with_imbalance'].fillna(0).astype(int)
             
             # % No Quality Flags = (Total Interviews - Interviews with Issues) / Total Interviews × 100
-            result['pct_no_quality_flags'] = ((result['total_interviews'] - result['interviews_with_issues']) / result['total_interviews'] * 100).round(0).astype(int)
+            result['pct_no_quality_flags'] = percent(result['total_interviews'] - result['interviews_with_issues'], result['total_interviews'])
             
             # Summary
             total_int = result['total_interviews'].sum()
             total_issues = result['interviews_with_issues'].sum()
             st.sidebar.success(f"✅ Clean interviews: {total_int - total_issues} / {total_int}")
             
-            # Merge imbalance stats
-            result = result.merge(cf02_per_ra, on='ra_name', how='left')
-            result['interviews_with_imbalance'] = result['interviews_with_imbalance'].fillna(0).astype(int)
-            result['pct_lt5pct_imbalance'] = ((result['total_interviews'] - result['interviews_with_imbalance']) / result['total_interviews'] * 100).round(0).astype(int)
+            result['pct_lt5pct_imbalance'] = percent(result['total_interviews'] - result['interviews_with_imbalance'], result['total_interviews'])
         else:
             result = completion_agg.copy()
             result['pct_no_quality_flags'] = 100
@@ -432,120 +607,25 @@ def fetch_all_metrics(start_date: str, end_date: str) -> pd.DataFrame:
         result['pct_no_quality_flags'] = 100
         result['pct_lt5pct_imbalance'] = 100
     
-    # Calculate Total CFs and Avg Answers from additional queries
+    # Calculate Total CFs, Avg Answers and % within 14-16 days from one extra query
     try:
-        st.sidebar.info("📄 Fetching cashflow stats...")
-        # Query cashflows separately (not joined with answers to avoid multiplication)
-        cf_query = f"""
-        SELECT 
-            cu.username AS ra_name,
-            COUNT(cf.id) AS total_cfs
-        FROM interviews i
-        JOIN households h ON h.id = i.household_id
-        LEFT JOIN core_users cu ON cu.id = i.interviewer_id
-        LEFT JOIN cashflows cf ON cf.interview_id = i.id AND cf.status = 1
-        WHERE h.project_id = 129
-          AND h.status = 1
-          AND h.out = 0
-          AND i.status = 1
-          AND i.interviewer_id IS NOT NULL
-          AND DATE(i.interview_start_date) BETWEEN '{start_date}' AND '{end_date}'
-          AND h.name NOT LIKE '%test%'
-        GROUP BY cu.username
-        """
-        engine = create_engine(DB_CONNECTION_STR)
-        with engine.connect() as conn:
-            cf_stats = pd.read_sql(text(cf_query), conn)
-        cf_stats = normalize_columns(cf_stats)
-        
-        if not cf_stats.empty:
-            result = result.merge(cf_stats[['ra_name', 'total_cfs']], on='ra_name', how='left')
-            result['total_cfs'] = result['total_cfs'].fillna(0).astype(int)
-        else:
-            result['total_cfs'] = 0
-            
-        # Query answers separately
-        st.sidebar.info("📄 Fetching answer stats...")
-        ans_query = f"""
-        SELECT 
-            cu.username AS ra_name,
-            COUNT(a.id) AS total_answers
-        FROM interviews i
-        JOIN households h ON h.id = i.household_id
-        LEFT JOIN core_users cu ON cu.id = i.interviewer_id
-        LEFT JOIN answers a ON a.interview_id = i.id
-        WHERE h.project_id = 129
-          AND h.status = 1
-          AND h.out = 0
-          AND i.status = 1
-          AND i.interviewer_id IS NOT NULL
-          AND DATE(i.interview_start_date) BETWEEN '{start_date}' AND '{end_date}'
-          AND h.name NOT LIKE '%test%'
-        GROUP BY cu.username
-        """
-        with engine.connect() as conn:
-            ans_stats = pd.read_sql(text(ans_query), conn)
-        ans_stats = normalize_columns(ans_stats)
-        
-        if not ans_stats.empty:
-            result = result.merge(ans_stats[['ra_name', 'total_answers']], on='ra_name', how='left')
-            result['avg_answers'] = (result['total_answers'].fillna(0) / result['total_interviews']).round(0).astype(int)
-        else:
-            result['avg_answers'] = 0
+        st.sidebar.info("📄 Fetching cashflow, answer and schedule stats...")
+        ra_stats = read_query(get_engine(), RA_STATS_QUERY, {'start_date': start_date, 'end_date': end_date})
+        ra_stats = normalize_columns(ra_stats)
     except Exception as e:
-        st.sidebar.warning(f"Could not fetch CF/answer stats: {e}")
+        st.sidebar.warning(f"Could not fetch CF/answer/schedule stats: {e}")
+        ra_stats = pd.DataFrame()
+    
+    if not ra_stats.empty:
+        ra_stats['pct_within_14_16_days'] = percent(ra_stats['on_schedule'], ra_stats['total_with_gap'])
+        result = result.merge(ra_stats[['ra_name', 'total_cfs', 'total_answers', 'pct_within_14_16_days']],
+                              on='ra_name', how='left')
+        result['total_cfs'] = result['total_cfs'].fillna(0).astype(int)
+        result['avg_answers'] = (result['total_answers'].fillna(0) / result['total_interviews']).round(0).astype(int)
+        result['pct_within_14_16_days'] = result['pct_within_14_16_days'].fillna(0).astype(int)
+    else:
         result['total_cfs'] = 0
         result['avg_answers'] = 0
-    
-    # Calculate % within 14-16 days from interview intervals
-    try:
-        st.sidebar.info("📄 Fetching schedule stats...")
-        # Use subquery instead of LATERAL (not supported in MySQL)
-        interval_query = f"""
-        SELECT 
-            cu.username AS ra_name,
-            SUM(CASE 
-                WHEN gap_days BETWEEN 14 AND 16 THEN 1 
-                ELSE 0 
-            END) AS on_schedule,
-            COUNT(*) AS total_interviews
-        FROM (
-            SELECT 
-                i.id AS interview_id,
-                i.interviewer_id,
-                DATEDIFF(i.interview_start_date, 
-                    (SELECT MAX(i2.interview_start_date) 
-                     FROM interviews i2 
-                     WHERE i2.household_id = i.household_id 
-                       AND i2.interview_start_date < i.interview_start_date
-                       AND i2.status = 1)
-                ) AS gap_days
-            FROM interviews i
-            JOIN households h ON h.id = i.household_id
-            WHERE h.project_id = 129
-              AND h.status = 1
-              AND h.out = 0
-              AND i.status = 1
-              AND i.interviewer_id IS NOT NULL
-              AND DATE(i.interview_start_date) BETWEEN '{start_date}' AND '{end_date}'
-              AND h.name NOT LIKE '%test%'
-        ) sub
-        JOIN core_users cu ON cu.id = sub.interviewer_id
-        WHERE sub.gap_days IS NOT NULL
-        GROUP BY cu.username
-        """
-        with engine.connect() as conn:
-            interval_stats = pd.read_sql(text(interval_query), conn)
-        interval_stats = normalize_columns(interval_stats)
-        
-        if not interval_stats.empty:
-            interval_stats['pct_within_14_16_days'] = (interval_stats['on_schedule'] / interval_stats['total_interviews'] * 100).round(0).astype(int)
-            result = result.merge(interval_stats[['ra_name', 'pct_within_14_16_days']], on='ra_name', how='left')
-            result['pct_within_14_16_days'] = result['pct_within_14_16_days'].fillna(0).astype(int)
-        else:
-            result['pct_within_14_16_days'] = 0
-    except Exception as e:
-        st.sidebar.warning(f"Could not fetch schedule stats: {e}")
         result['pct_within_14_16_days'] = 0
     
     st.sidebar.info(f"Columns: {list(result.columns)}")
@@ -553,44 +633,81 @@ def fetch_all_metrics(start_date: str, end_date: str) -> pd.DataFrame:
     return result
 
 
+# Score columns in legacy leaderboard CSVs are 0-5; nullable Int8 so a blank cell doesn't fail the parse
+LEADERBOARD_CSV_DTYPES = {'schedule_score': 'Int8', 'quality_score': 'Int8', 'completion_score': 'Int8'}
+
+
 def get_cached_data_path(month_key: str) -> Path:
     """Get the cache file path for a specific month."""
-    return DATA_DIR / f"cached_leaderboard_{month_key}.csv"
+    return DATA_DIR / f"cached_leaderboard_{month_key}.parquet"
 
 
 def get_cached_quality_path(month_key: str) -> Path:
     """Get the quality cache file path for a specific month."""
-    return DATA_DIR / f"cached_quality_{month_key}.csv"
+    return DATA_DIR / f"cached_quality_{month_key}.parquet"
+
+
+# Bounded so superseded mtimes get evicted; sized above the number of monthly files the
+# quality trend reads on every render
+@st.cache_data(max_entries=64, show_spinner=False)
+def _read_cache_file(path: str, mtime: float, dtype: 'dict | None' = None) -> pd.DataFrame:
+    """Parse a cache file (Parquet or CSV); keyed on mtime so a rewritten file is re-read."""
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    # pyarrow's multithreaded CSV reader is faster than the default C parser
+    return pd.read_csv(path, dtype=dtype, engine='pyarrow')
+
+
+def _load_cache_file(path: Path, dtype: 'dict | None' = None) -> pd.DataFrame:
+    """Load a cache file via _read_cache_file, or an empty frame if it doesn't exist."""
+    try:
+        return _read_cache_file(str(path), path.stat().st_mtime, dtype)
+    except FileNotFoundError:
+        return pd.DataFrame()
 
 
 def load_cached_data(month_key: str) -> pd.DataFrame:
     """Load cached leaderboard data for a specific month."""
     cache_path = get_cached_data_path(month_key)
-    if cache_path.exists():
-        return pd.read_csv(cache_path)
-    return pd.DataFrame()
+    df = _load_cache_file(cache_path)
+    if df.empty:
+        # Months cached before the switch to Parquet; a blank score counts as 0 (not rated)
+        df = _load_cache_file(cache_path.with_suffix('.csv'), LEADERBOARD_CSV_DTYPES)
+        score_cols = df.columns.intersection(list(LEADERBOARD_CSV_DTYPES))
+        df[score_cols] = df[score_cols].fillna(0).astype('int8')
+    return df
 
 
 def save_cached_data(df: pd.DataFrame, month_key: str):
     """Save leaderboard data to monthly cache file."""
     DATA_DIR.mkdir(parents=True, exist_ok=True)
     cache_path = get_cached_data_path(month_key)
-    df.to_csv(cache_path, index=False)
+    # Parquet keeps the score dtypes and is much faster to read back than CSV
+    df.to_parquet(cache_path, engine='pyarrow', compression='zstd', index=False)
 
 
 def load_cached_quality(month_key: str) -> pd.DataFrame:
     """Load cached quality issues data for a specific month."""
     cache_path = get_cached_quality_path(month_key)
-    if cache_path.exists():
-        return pd.read_csv(cache_path)
-    return pd.DataFrame()
+    df = _load_cache_file(cache_path)
+    if df.empty:
+        # Months cached before the switch to Parquet
+        df = _load_cache_file(cache_path.with_suffix('.csv'))
+    return df
 
 
 def save_cached_quality(df: pd.DataFrame, month_key: str):
     """Save quality issues data to monthly cache file."""
     DATA_DIR.mkdir(parents=True, exist_ok=True)
     cache_path = get_cached_quality_path(month_key)
-    df.to_csv(cache_path, index=False)
+    df.to_parquet(cache_path, engine='pyarrow', compression='zstd', index=False)
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _read_json_cached(path: str, mtime: float) -> dict:
+    """Parse a JSON file; keyed on mtime so a rewritten file is re-read."""
+    with open(path, 'r') as f:
+        return json.load(f)
 
 
 def load_manual_scores() -> dict:
@@ -621,10 +738,10 @@ def load_manual_scores() -> dict:
             st.sidebar.warning(f"⚠️ Supabase read error: {str(e)[:50]}")
     
     # Fallback to local JSON
-    if MANUAL_SCORES_FILE.exists():
-        with open(MANUAL_SCORES_FILE, 'r') as f:
-            return json.load(f)
-    return {}
+    try:
+        return _read_json_cached(str(MANUAL_SCORES_FILE), MANUAL_SCORES_FILE.stat().st_mtime)
+    except FileNotFoundError:
+        return {}
 
 
 def save_manual_scores(scores: dict):
@@ -632,10 +749,18 @@ def save_manual_scores(scores: dict):
     Save manual scores to Supabase (if available) and local JSON file.
     scores format: {month_key: {ra_name: {journal: x, feedback: y, team: z}}}
     """
-    # Always save to local JSON as backup
+    # Always save to local JSON as backup. Skip the write if nothing changed, and
+    # write via a temp file + os.replace so a crash never leaves a truncated file.
     DATA_DIR.mkdir(parents=True, exist_ok=True)
-    with open(MANUAL_SCORES_FILE, 'w') as f:
-        json.dump(scores, f, indent=2)
+    payload = json.dumps(scores, separators=(',', ':'))
+    try:
+        unchanged = MANUAL_SCORES_FILE.read_text() == payload
+    except FileNotFoundError:
+        unchanged = False
+    if not unchanged:
+        tmp_path = MANUAL_SCORES_FILE.with_suffix('.tmp')
+        tmp_path.write_text(payload)
+        os.replace(tmp_path, MANUAL_SCORES_FILE)
     
     # Try to save to Supabase
     supabase = get_supabase_client()
@@ -668,11 +793,13 @@ def load_all_quality_trend_data() -> pd.DataFrame:
     """
     all_data = []
     
-    # Find all cached quality files
-    quality_files = list(DATA_DIR.glob("cached_quality_*.csv"))
+    # Find all cached quality files; a month's Parquet cache supersedes its legacy CSV
+    quality_files = {}
+    for qf in sorted(DATA_DIR.glob("cached_quality_*.csv")) + sorted(DATA_DIR.glob("cached_quality_*.parquet")):
+        quality_files[qf.stem] = qf
     
-    for qf in quality_files:
-        # Extract month_key from filename (e.g., cached_quality_2025_12.csv -> 2025_12)
+    for qf in quality_files.values():
+        # Extract month_key from filename (e.g., cached_quality_2025_12.parquet -> 2025_12)
         filename = qf.stem
         if filename == 'cached_quality' or '_' not in filename:
             continue  # Skip the old non-monthly file
@@ -691,13 +818,13 @@ def load_all_quality_trend_data() -> pd.DataFrame:
             continue
         
         try:
-            df = pd.read_csv(qf)
+            df = _load_cache_file(qf)
             df = normalize_columns(df)
             
             # Find RA column
-            ra_col = next((c for c in df.columns if 'ra' in c.lower() and 'name' in c.lower()), 
-                         next((c for c in df.columns if 'ra' in c.lower()), None))
-            issue_col = next((c for c in df.columns if 'issue' in c.lower() and 'desc' in c.lower()), None)
+            cols = list(df.columns)
+            ra_col = find_col(cols, 'ra', 'name') or find_col(cols, 'ra')
+            issue_col = find_col(cols, 'issue', 'desc')
             
             if ra_col:
                 # Exclude non-RA users
@@ -705,59 +832,26 @@ def load_all_quality_trend_data() -> pd.DataFrame:
                 
                 # Categorize issues for detailed breakdown
                 if issue_col:
-                    def categorize_issue(desc):
-                        desc_lower = str(desc).lower()
-                        if 'not linked' in desc_lower or 'unlinked' in desc_lower:
-                            return 'Unlinked Transactions'
-                        elif 'imbalance' in desc_lower:
-                            return 'Sources/Uses Imbalance'
-                        elif 'cash on hand' in desc_lower:
-                            return 'Cash Balance Missing'
-                        elif 'in-kind' in desc_lower:
-                            return 'In-Kind Recording Issues'
-                        elif '21 days' in desc_lower:
-                            return 'Outdated Transactions'
-                        elif 'medicine' in desc_lower or 'health' in desc_lower:
-                            return 'Health Record Issues'
-                        elif 'pregnancy' in desc_lower:
-                            return 'Pregnancy Tracking Issues'
-                        elif 'm-pesa' in desc_lower or 'mpesa' in desc_lower:
-                            return 'Unlinked Transactions'  # M-Pesa falls under linking
-                        else:
-                            return 'Other Data Issues'
-                    
-                    df['issue_category'] = df[issue_col].apply(categorize_issue)
+                    df['issue_category'] = categorize_issues(df[issue_col], TREND_ISSUE_CATEGORY_PATTERNS)
                 else:
                     df['issue_category'] = 'Unknown'
                 
-                # Count issues per RA per category
-                for ra in df[ra_col].unique():
-                    ra_data = df[df[ra_col] == ra]
-                    
-                    # Total count
-                    all_data.append({
-                        'month': month_label,
-                        'month_order': f"{year:04d}_{month:02d}",
-                        'ra_name': str(ra).title(),
-                        'issue_count': len(ra_data),
-                        'issue_category': 'Total'
-                    })
-                    
-                    # By category
-                    for cat in ra_data['issue_category'].unique():
-                        cat_count = len(ra_data[ra_data['issue_category'] == cat])
-                        all_data.append({
-                            'month': month_label,
-                            'month_order': f"{year:04d}_{month:02d}",
-                            'ra_name': str(ra).title(),
-                            'issue_count': cat_count,
-                            'issue_category': cat
-                        })
+                # Count issues per RA (Total) and per RA per category, then title-case
+                # the RA names once on the small counts frame rather than per RA
+                month_order = f"{year:04d}_{month:02d}"
+                totals = df.groupby(ra_col, sort=False).size().reset_index(name='issue_count')
+                totals['issue_category'] = 'Total'
+                by_category = df.groupby([ra_col, 'issue_category'], sort=False).size().reset_index(name='issue_count')
+                counts = pd.concat([totals, by_category], ignore_index=True)
+                counts['ra_name'] = counts[ra_col].astype(str).str.title()
+                counts['month'] = month_label
+                counts['month_order'] = month_order
+                all_data.append(counts[['month', 'month_order', 'ra_name', 'issue_count', 'issue_category']])
         except Exception as e:
             continue
     
     if all_data:
-        result = pd.DataFrame(all_data)
+        result = pd.concat(all_data, ignore_index=True)
         # Sort by month_order to ensure chronological order
         result = result.sort_values('month_order')
         return result
@@ -770,82 +864,104 @@ def save_manual_scores_json(scores: dict):
         json.dump(scores, f, indent=2)
 
 
+# Inner score boundaries: a percentage in (-1, edges[0]] scores 1, ... (edges[-1], 100] scores 5.
+# Equivalent to pd.cut(bins=[-1, *edges, 100], labels=[1, 2, 3, 4, 5]) with out-of-range → 0.
+SCHEDULE_SCORE_EDGES = np.array([59.9, 69.9, 79.9, 89.9])
+QUALITY_SCORE_EDGES = np.array([79.9, 84.9, 89.9, 94.9])
+COMPLETION_SCORE_EDGES = np.array([59.9, 69.9, 79.9, 89.9])
+
+
+def bin_score(values: pd.Series, edges: np.ndarray) -> np.ndarray:
+    """Map percentages to 1-5 scores with a single searchsorted (missing counts as 0%)."""
+    vals = values.fillna(0).to_numpy(dtype=np.float64)
+    scores = np.searchsorted(edges, vals, side='left') + 1
+    return np.where((vals > -1) & (vals <= 100), scores, 0).astype(np.int8)
+
+
+@st.cache_data(show_spinner=False)
 def calculate_scores(df: pd.DataFrame) -> pd.DataFrame:
     df = df.copy()
     
     # Schedule Score (based on % within 14-16 days)
     schedule_col = next((c for c in df.columns if 'within' in c.lower() or '14_16' in c.lower()), None)
     if schedule_col and schedule_col in df.columns:
-        df['schedule_score'] = pd.cut(df[schedule_col].fillna(0),
-            bins=[-1, 59.9, 69.9, 79.9, 89.9, 100], labels=[1, 2, 3, 4, 5]).astype(float).fillna(0).astype(int)
+        df['schedule_score'] = bin_score(df[schedule_col], SCHEDULE_SCORE_EDGES)
     else:
         df['schedule_score'] = 0
     
     # Quality Score (based on % no quality flags)
     quality_col = next((c for c in df.columns if 'quality' in c.lower() and 'flag' in c.lower()), None)
     if quality_col and quality_col in df.columns:
-        df['quality_score'] = pd.cut(df[quality_col].fillna(0),
-            bins=[-1, 79.9, 84.9, 89.9, 94.9, 100], labels=[1, 2, 3, 4, 5]).astype(float).fillna(0).astype(int)
+        df['quality_score'] = bin_score(df[quality_col], QUALITY_SCORE_EDGES)
     else:
         df['quality_score'] = 0
     
     # Completion Score (based on % complete) - NEW
     completion_col = next((c for c in df.columns if 'pct_complete' in c.lower() or c == 'pct_complete'), None)
     if completion_col and completion_col in df.columns:
-        df['completion_score'] = pd.cut(df[completion_col].fillna(0),
-            bins=[-1, 59.9, 69.9, 79.9, 89.9, 100], labels=[1, 2, 3, 4, 5]).astype(float).fillna(0).astype(int)
+        df['completion_score'] = bin_score(df[completion_col], COMPLETION_SCORE_EDGES)
     else:
         df['completion_score'] = 0
     
     return df
 
 
+@st.cache_data(show_spinner=False)
 def combine_scores(auto_df: pd.DataFrame, manual_scores: dict, month_key: str) -> pd.DataFrame:
     df = auto_df.copy()
     month_scores = manual_scores.get(month_key, {})
-    df['journal_score'] = df['ra_name'].apply(lambda x: month_scores.get(str(x) if x else '', {}).get('journal', 0))
-    df['feedback_score'] = df['ra_name'].apply(lambda x: month_scores.get(str(x) if x else '', {}).get('feedback', 0))
-    df['team_score'] = df['ra_name'].apply(lambda x: month_scores.get(str(x) if x else '', {}).get('team', 0))
+    ra_names = df['ra_name'].fillna('').astype(str)
+    for key in ['journal', 'feedback', 'team']:
+        score_map = {ra: s.get(key, 0) for ra, s in month_scores.items()}
+        df[f'{key}_score'] = ra_names.map(score_map).fillna(0).astype('int8')
     # Total now includes completion_score (max 30 points)
-    df['total_score'] = (df['schedule_score'] + df['quality_score'] + df['completion_score'] + 
-                         df['journal_score'] + df['feedback_score'] + df['team_score'])
+    score_cols = ['schedule_score', 'quality_score', 'completion_score', 'journal_score', 'feedback_score', 'team_score']
+    df['total_score'] = df[score_cols].to_numpy(dtype=np.int16).sum(axis=1)
     df['rank'] = df['total_score'].rank(method='min', ascending=False).astype(int)
+    # Display name, computed once per data change instead of in every renderer
+    df['ra_name_title'] = df['ra_name'].astype(str).str.title()
     return df.sort_values('rank')
 
 
 # --------------------------------------------------------------------
 # Custom CSS
 # --------------------------------------------------------------------
+CSS_HTML = """
+<style>
+.header-container {
+    background: linear-gradient(135deg, #1a1a2e 0%, #16213e 50%, #0f3460 100%);
+    padding: 0.8rem 1.5rem; border-radius: 12px; margin-bottom: 0.5rem; 
+    display: flex; align-items: center; justify-content: center; gap: 1rem;
+}
+.header-container h1 { color: #ffd700; font-size: 1.5rem; margin: 0; }
+.header-container p { color: #e8e8e8; font-size: 0.95rem; margin: 0; }
+
+.winner-card {
+    background: linear-gradient(135deg, #f5af19 0%, #f12711 100%);
+    padding: 2rem; border-radius: 20px; text-align: center; color: white;
+    box-shadow: 0 10px 40px rgba(245, 175, 25, 0.4);
+}
+.winner-card h1 { font-size: 3rem; margin: 0.5rem 0; }
+
+.metric-card {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    padding: 1.5rem; border-radius: 15px; text-align: center; color: white;
+}
+.metric-card h3 { font-size: 2rem; margin: 0; }
+
+.quality-card {
+    background: #f8f9fa; padding: 1rem; border-radius: 10px;
+    border-left: 4px solid #28a745; margin: 0.5rem 0;
+}
+</style>
+"""
+
+# Static header shell; only the month name is filled in per render
+HEADER_HTML = '<div class="header-container"><h1>🏆 RA Performance Dashboard</h1><p>| {month_name}</p></div>'
+
+
 def inject_css():
-    st.markdown("""
-    <style>
-    .header-container {
-        background: linear-gradient(135deg, #1a1a2e 0%, #16213e 50%, #0f3460 100%);
-        padding: 0.8rem 1.5rem; border-radius: 12px; margin-bottom: 0.5rem; 
-        display: flex; align-items: center; justify-content: center; gap: 1rem;
-    }
-    .header-container h1 { color: #ffd700; font-size: 1.5rem; margin: 0; }
-    .header-container p { color: #e8e8e8; font-size: 0.95rem; margin: 0; }
-    
-    .winner-card {
-        background: linear-gradient(135deg, #f5af19 0%, #f12711 100%);
-        padding: 2rem; border-radius: 20px; text-align: center; color: white;
-        box-shadow: 0 10px 40px rgba(245, 175, 25, 0.4);
-    }
-    .winner-card h1 { font-size: 3rem; margin: 0.5rem 0; }
-    
-    .metric-card {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 1.5rem; border-radius: 15px; text-align: center; color: white;
-    }
-    .metric-card h3 { font-size: 2rem; margin: 0; }
-    
-    .quality-card {
-        background: #f8f9fa; padding: 1rem; border-radius: 10px;
-        border-left: 4px solid #28a745; margin: 0.5rem 0;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    st.markdown(CSS_HTML, unsafe_allow_html=True)
 
 
 # --------------------------------------------------------------------
@@ -856,7 +972,7 @@ def render_data_summary(df: pd.DataFrame, month_name: str):
     st.markdown("**Green** = Good (≥90%), **Yellow** = OK (70-89%), **Red** = Needs Improvement (<70%)")
     
     column_map = {
-        'ra_name': 'RA Name',
+        'ra_name_title': 'RA Name',
         'total_interviews': 'Total Interviews',
         'total_cfs': 'Total CFs',
         'avg_answers': 'Avg Answers',
@@ -880,23 +996,22 @@ def render_data_summary(df: pd.DataFrame, month_name: str):
     display_cols = [c for c in desired_cols if c in display_df.columns]
     display_df = display_df[display_cols]
     
-    if 'RA Name' in display_df.columns:
-        display_df['RA Name'] = display_df['RA Name'].str.title()
-    
     pct_cols = ['% Complete', '% No Quality Flags', '% <5% Imbalance', '% Within 14-16 Days']
     
-    def highlight_metrics(val, col_name):
-        if pd.isna(val) or col_name not in pct_cols:
-            return ''
-        try:
-            val = float(val)
-            if val >= 90: return 'background-color: #28a745; color: white;'
-            elif val >= 70: return 'background-color: #ffc107; color: black;'
-            else: return 'background-color: #dc3545; color: white;'
-        except:
-            return ''
+    # Build the whole style matrix up front instead of calling a Python function per cell
+    styles = pd.DataFrame('', index=display_df.index, columns=display_df.columns)
+    for col in pct_cols:
+        if col in display_df.columns:
+            vals = display_df[col].to_numpy(dtype=float)
+            styles[col] = np.select(
+                [vals >= 90, vals >= 70, vals < 70],
+                ['background-color: #28a745; color: white;',
+                 'background-color: #ffc107; color: black;',
+                 'background-color: #dc3545; color: white;'],
+                default=''
+            )
     
-    styled = display_df.style.apply(lambda x: [highlight_metrics(v, x.name) for v in x], axis=0)
+    styled = display_df.style.apply(lambda _: styles, axis=None)
     st.dataframe(styled, use_container_width=True, height=450, hide_index=True)
     
     # Visualizations
@@ -908,45 +1023,77 @@ def render_data_summary(df: pd.DataFrame, month_name: str):
         # Quality comparison bar chart
         st.markdown("#### Quality Score Distribution")
         if 'pct_no_quality_flags' in df.columns:
-            chart_df = df[['ra_name', 'pct_no_quality_flags']].copy()
-            chart_df['ra_name'] = chart_df['ra_name'].str.title()
+            chart_df = df[['ra_name_title', 'pct_no_quality_flags']].rename(columns={'ra_name_title': 'ra_name'})
             chart_df = chart_df.sort_values('pct_no_quality_flags', ascending=True)
-            
-            # Color based on score
-            chart_df['Color'] = chart_df['pct_no_quality_flags'].apply(
-                lambda x: '#dc3545' if x < 70 else ('#ffc107' if x < 90 else '#28a745')
-            )
-            
-            fig = px.bar(chart_df, x='pct_no_quality_flags', y='ra_name', orientation='h',
-                        color='pct_no_quality_flags', 
-                        color_continuous_scale=['#dc3545', '#ffc107', '#28a745'],
-                        range_color=[50, 100])
-            fig.update_layout(
-                xaxis_title="% No Quality Flags", yaxis_title="",
-                xaxis_range=[0, 100], height=350, showlegend=False,
-                coloraxis_showscale=False
-            )
+            fig = build_pct_bar_chart(frame_hash(chart_df), chart_df, 'pct_no_quality_flags', "% No Quality Flags")
             st.plotly_chart(fig, use_container_width=True)
     
     with viz_col2:
         # Schedule compliance bar chart
         st.markdown("#### Schedule Compliance (14-16 Days)")
         if 'pct_within_14_16_days' in df.columns:
-            chart_df = df[['ra_name', 'pct_within_14_16_days']].copy()
-            chart_df['ra_name'] = chart_df['ra_name'].str.title()
+            chart_df = df[['ra_name_title', 'pct_within_14_16_days']].rename(columns={'ra_name_title': 'ra_name'})
             chart_df = chart_df.sort_values('pct_within_14_16_days', ascending=True)
-            
-            fig = px.bar(chart_df, x='pct_within_14_16_days', y='ra_name', orientation='h',
-                        color='pct_within_14_16_days',
-                        color_continuous_scale=['#dc3545', '#ffc107', '#28a745'],
-                        range_color=[50, 100])
-            fig.update_layout(
-                xaxis_title="% Within Schedule", yaxis_title="",
-                xaxis_range=[0, 100], height=350, showlegend=False,
-                coloraxis_showscale=False
-            )
+            fig = build_pct_bar_chart(frame_hash(chart_df), chart_df, 'pct_within_14_16_days', "% Within Schedule")
             st.plotly_chart(fig, use_container_width=True)
     
+    render_quality_trend()
+    
+    # Team Totals
+    st.markdown("### 📈 Team Totals")
+    cols = st.columns(4)
+    
+    def safe_sum(col_names):
+        for c in col_names:
+            if c in df.columns:
+                return int(df[c].sum())
+        return 0
+    
+    def safe_mean(col_names):
+        for c in col_names:
+            if c in df.columns:
+                return f"{int(df[c].mean())}%"
+        return "N/A"
+    
+    metrics = [
+        (str(safe_sum(['total_interviews'])), "Total Interviews", "📋"),
+        (str(safe_sum(['total_cfs'])), "Total Cashflows", "💰"),
+        (safe_mean(['pct_complete']), "Avg Completion", "✅"),
+        (safe_mean(['pct_no_quality_flags']), "Avg Quality", "🎯"),
+    ]
+    for col, (value, label, icon) in zip(cols, metrics):
+        with col:
+            st.markdown(f'<div class="metric-card"><p>{icon}</p><h3>{value}</h3><p>{label}</p></div>', unsafe_allow_html=True)
+
+
+def frame_hash(df: pd.DataFrame) -> int:
+    """Content hash of a small DataFrame (index included).
+    
+    Figure builders and the CSV download take this as df_hash and the frame itself as an
+    underscore argument, so Streamlit skips hashing the frame and reruns with unchanged
+    data reuse the cached result.
+    """
+    return int(pd.util.hash_pandas_object(df).sum())
+
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def build_pct_bar_chart(df_hash: int, _chart_df: pd.DataFrame, value_col: str, axis_title: str) -> go.Figure:
+    """Build a red-to-green per-RA % bar chart."""
+    fig = px.bar(_chart_df, x=value_col, y='ra_name', orientation='h',
+                color=value_col,
+                color_continuous_scale=['#dc3545', '#ffc107', '#28a745'],
+                range_color=[50, 100])
+    fig.update_layout(
+        xaxis_title=axis_title, yaxis_title="",
+        xaxis_range=[0, 100], height=350, showlegend=False,
+        coloraxis_showscale=False
+    )
+    return fig
+
+
+@st.fragment
+def render_quality_trend():
+    """Quality trend chart; a fragment so switching its view doesn't rerun the whole page."""
     # Quality Issues Trend Over Time
     st.markdown("### 📈 Quality Issues Trend Over Time")
     st.caption("Track improvements in quality over time — lower numbers mean fewer issues")
@@ -1031,32 +1178,32 @@ def render_data_summary(df: pd.DataFrame, month_name: str):
                 st.plotly_chart(fig, use_container_width=True)
     else:
         st.info("📊 Quality trend data will appear once you have multiple months of cached data.")
-    
-    # Team Totals
-    st.markdown("### 📈 Team Totals")
-    cols = st.columns(4)
-    
-    def safe_sum(col_names):
-        for c in col_names:
-            if c in df.columns:
-                return int(df[c].sum())
-        return 0
-    
-    def safe_mean(col_names):
-        for c in col_names:
-            if c in df.columns:
-                return f"{int(df[c].mean())}%"
-        return "N/A"
-    
-    metrics = [
-        (str(safe_sum(['total_interviews'])), "Total Interviews", "📋"),
-        (str(safe_sum(['total_cfs'])), "Total Cashflows", "💰"),
-        (safe_mean(['pct_complete']), "Avg Completion", "✅"),
-        (safe_mean(['pct_no_quality_flags']), "Avg Quality", "🎯"),
-    ]
-    for col, (value, label, icon) in zip(cols, metrics):
-        with col:
-            st.markdown(f'<div class="metric-card"><p>{icon}</p><h3>{value}</h3><p>{label}</p></div>', unsafe_allow_html=True)
+
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def build_score_chart(df_hash: int, _chart_df: pd.DataFrame) -> go.Figure:
+    """Build the score breakdown bar chart."""
+    fig = px.bar(_chart_df, x='RA', y='Score', color='Category', 
+                 barmode='group', color_discrete_sequence=px.colors.qualitative.Set2,
+                 title="")
+    fig.update_layout(
+        xaxis_title="", yaxis_title="Score (0-5)", 
+        yaxis_range=[0, 5.5],
+        legend_title="Category",
+        height=400
+    )
+    return fig
+
+
+# Heatmap cell colours for scores 0-5 (red → yellow → green, as in the summary table)
+SCORE_CELL_STYLES = np.array([
+    'background-color: #dc3545; color: white;',
+    'background-color: #ee7b26; color: white;',
+    'background-color: #ffc107; color: black;',
+    'background-color: #ffc107; color: black;',
+    'background-color: #94b426; color: white;',
+    'background-color: #28a745; color: white;',
+])
 
 
 def render_ra_of_month(df: pd.DataFrame, month_name: str):
@@ -1076,7 +1223,7 @@ def render_ra_of_month(df: pd.DataFrame, month_name: str):
     for i, col in enumerate(cols):
         if i < len(df):
             ra = df.iloc[i]
-            ra_name = str(ra['ra_name']).title() if 'ra_name' in ra else 'TBD'
+            ra_name = ra['ra_name_title'] if 'ra_name_title' in ra else 'TBD'
             score = int(ra['total_score']) if 'total_score' in ra else 0
             
             with col:
@@ -1092,6 +1239,27 @@ def render_ra_of_month(df: pd.DataFrame, month_name: str):
     
     st.divider()
     
+    # Charts are built on demand: st.tabs runs every tab body on each rerun,
+    # so without this the plotly figures are rebuilt even when this tab is hidden
+    if not st.session_state.get('charts_loaded', False):
+        if st.button("📊 Load charts", key="load_charts"):
+            st.session_state.charts_loaded = True
+    if st.session_state.get('charts_loaded', False):
+        render_score_charts(df)
+    
+    st.divider()
+    
+    # Full Leaderboard - now includes completion
+    st.markdown("### 📋 Full Leaderboard")
+    score_cols_display = ['rank', 'ra_name_title', 'total_score', 'schedule_score', 'completion_score', 'quality_score', 'journal_score', 'feedback_score', 'team_score']
+    display_cols = [c for c in score_cols_display if c in df.columns]
+    display_df = df[display_cols].copy()
+    display_df.columns = ['Rank', 'RA Name', 'Total', 'Schedule', 'Completion', 'Quality', 'Journal', 'Feedback', 'Team'][:len(display_cols)]
+    st.dataframe(display_df, use_container_width=True, height=400, hide_index=True)
+
+
+def render_score_charts(df: pd.DataFrame):
+    """Score breakdown bar chart and focus-area heatmap for the RA of the Month tab."""
     # Score Breakdown Visualization
     st.markdown("### 📊 Score Breakdown by Category")
     
@@ -1099,85 +1267,37 @@ def render_ra_of_month(df: pd.DataFrame, month_name: str):
     score_cols = ['schedule_score', 'completion_score', 'quality_score', 'journal_score', 'feedback_score', 'team_score']
     score_labels = ['Schedule', 'Completion', 'Quality', 'Journal', 'Feedback', 'Team']
     
-    chart_data = []
-    for _, row in df.iterrows():
-        ra_name = str(row['ra_name']).title() if 'ra_name' in row else 'Unknown'
-        for col, label in zip(score_cols, score_labels):
-            if col in row:
-                chart_data.append({'RA': ra_name, 'Category': label, 'Score': int(row[col])})
-    
-    if chart_data:
-        chart_df = pd.DataFrame(chart_data)
-        fig = px.bar(chart_df, x='RA', y='Score', color='Category', 
-                     barmode='group', color_discrete_sequence=px.colors.qualitative.Set2,
-                     title="")
-        fig.update_layout(
-            xaxis_title="", yaxis_title="Score (0-5)", 
-            yaxis_range=[0, 5.5],
-            legend_title="Category",
-            height=400
-        )
+    label_map = {col: label for col, label in zip(score_cols, score_labels) if col in df.columns}
+    
+    # One row per RA with a column per category; the bar chart wants it long-form
+    heatmap_df = df.set_index('ra_name_title')[list(label_map)].astype('int16').rename(columns=label_map)
+    heatmap_df.index.name = 'RA'
+    
+    if not heatmap_df.empty:
+        chart_df = heatmap_df.reset_index().melt(id_vars='RA', var_name='Category', value_name='Score')
+        fig = build_score_chart(frame_hash(chart_df), chart_df)
         st.plotly_chart(fig, use_container_width=True)
     
     # Focus Areas for Growth - Heatmap Visualization
     st.markdown("### 🎯 Focus Areas for Growth")
     
-    # Create matrix data for heatmap
-    heatmap_data = []
-    for _, row in df.iterrows():
-        ra_name = str(row['ra_name']).title() if 'ra_name' in row else 'Unknown'
-        row_data = {'RA': ra_name}
-        for col, label in zip(score_cols, score_labels):
-            if col in row:
-                row_data[label] = int(row[col])
-        heatmap_data.append(row_data)
-    
-    if heatmap_data:
-        heatmap_df = pd.DataFrame(heatmap_data)
-        heatmap_df = heatmap_df.set_index('RA')
-        
-        # Create heatmap using plotly
-        fig = go.Figure(data=go.Heatmap(
-            z=heatmap_df.values,
-            x=heatmap_df.columns,
-            y=heatmap_df.index,
-            colorscale=[[0, '#dc3545'], [0.4, '#ffc107'], [0.6, '#ffc107'], [1, '#28a745']],
-            zmin=0, zmax=5,
-            text=heatmap_df.values,
-            texttemplate="%{text}",
-            textfont={"size": 14, "color": "white"},
-            hovertemplate="RA: %{y}<br>Category: %{x}<br>Score: %{z}<extra></extra>"
-        ))
-        fig.update_layout(
-            height=max(300, len(heatmap_df) * 35),
-            xaxis_title="",
-            yaxis_title="",
-            yaxis={'categoryorder': 'total ascending'}
-        )
-        st.plotly_chart(fig, use_container_width=True)
+    if not heatmap_df.empty:
+        # A colour-coded table instead of a Plotly heatmap: same information for a
+        # small RA x category matrix, at a fraction of the payload
+        styles = pd.DataFrame(SCORE_CELL_STYLES[heatmap_df.to_numpy().clip(0, 5)],
+                              index=heatmap_df.index, columns=heatmap_df.columns)
+        styled = heatmap_df.style.apply(lambda _: styles, axis=None)
+        st.dataframe(styled, use_container_width=True, height=(len(heatmap_df) + 1) * 35 + 3)
         
         # Summary of critical areas
-        critical_count = sum(1 for _, row in df.iterrows() 
-                            for col in score_cols if col in row and int(row[col]) <= 1)
-        warning_count = sum(1 for _, row in df.iterrows() 
-                           for col in score_cols if col in row and int(row[col]) == 2)
+        scores = heatmap_df.to_numpy()
+        critical_count = int((scores <= 1).sum())
+        warning_count = int((scores == 2).sum())
         
         if critical_count > 0 or warning_count > 0:
             st.markdown(f"**Summary:** 🔴 {critical_count} critical (score ≤1), 🟡 {warning_count} needs work (score = 2)")
         else:
             st.success("✅ All RAs performing well across all categories!")
-    
-    st.divider()
-    
-    # Full Leaderboard - now includes completion
-    st.markdown("### 📋 Full Leaderboard")
-    score_cols_display = ['rank', 'ra_name', 'total_score', 'schedule_score', 'completion_score', 'quality_score', 'journal_score', 'feedback_score', 'team_score']
-    display_cols = [c for c in score_cols_display if c in df.columns]
-    display_df = df[display_cols].copy()
-    display_df.columns = ['Rank', 'RA Name', 'Total', 'Schedule', 'Completion', 'Quality', 'Journal', 'Feedback', 'Team'][:len(display_cols)]
-    if 'RA Name' in display_df.columns:
-        display_df['RA Name'] = display_df['RA Name'].str.title()
-    st.dataframe(display_df, use_container_width=True, height=400, hide_index=True)
 
 
 def render_quality_guidelines():
@@ -1252,6 +1372,57 @@ def render_quality_guidelines():
     st.info("💡 **Tip:** If something doesn't make sense in the data, explain it in the journal!")
 
 
+def categorize_issues(descs: pd.Series, patterns: list = ISSUE_CATEGORY_PATTERNS) -> pd.Series:
+    """Map issue descriptions to categories (first matching pattern wins).
+    
+    Descriptions are templated and repeat heavily, so patterns are matched once per
+    distinct description and the labels broadcast back via the factorize codes.
+    """
+    codes, uniques = pd.factorize(descs.astype(str), use_na_sentinel=False)
+    uniques = pd.Series(uniques)
+    conditions = [uniques.str.contains(p, case=False, flags=re.DOTALL, regex=True, na=False).to_numpy(dtype=bool)
+                  for _, p in patterns]
+    labels = [label for label, _ in patterns]
+    return pd.Series(np.select(conditions, labels, default='Other Data Issues')[codes], index=descs.index)
+
+
+def count_issue_categories(categories: pd.Series) -> pd.DataFrame:
+    """Category/Count frame, most frequent first; ties keep first-appearance order like value_counts."""
+    counts = categories.groupby(categories, observed=True, sort=False).size()
+    return counts.sort_values(ascending=False, kind='stable').rename_axis('Category').reset_index(name='Count')
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def build_issue_category_chart(df_hash: int, _counts: pd.DataFrame) -> go.Figure:
+    """Build the issues-by-category bar chart."""
+    fig = px.bar(_counts, x='Count', y='Category', orientation='h',
+                color='Count', color_continuous_scale='Reds')
+    fig.update_layout(
+        height=350, showlegend=False, coloraxis_showscale=False,
+        yaxis={'categoryorder':'total ascending'},
+        xaxis_title="Number of Issues", yaxis_title=""
+    )
+    return fig
+
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def build_ra_issue_chart(df_hash: int, _ra_counts: pd.DataFrame) -> go.Figure:
+    """Build the issues-per-RA bar chart."""
+    fig = px.bar(_ra_counts, x='Issue Count', y='RA', orientation='h',
+                color='Issue Count', color_continuous_scale='RdYlGn_r')
+    fig.update_layout(height=350, showlegend=False, coloraxis_showscale=False,
+                    xaxis_title="Number of Issues", yaxis_title="")
+    return fig
+
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def build_issue_category_pie(df_hash: int, _counts: pd.DataFrame) -> go.Figure:
+    """Build the single-RA category breakdown pie."""
+    fig = px.pie(_counts, values='Count', names='Category', 
+               color_discrete_sequence=px.colors.qualitative.Set3)
+    fig.update_layout(height=350)
+    return fig
+
+
 def render_quality_issues(quality_df: pd.DataFrame, month_name: str):
     """Render quality issues analysis with RA filter for training insights."""
     st.markdown(f"## 🔍 Quality Issues Analysis - {month_name}")
@@ -1263,21 +1434,30 @@ def render_quality_issues(quality_df: pd.DataFrame, month_name: str):
     quality_df = normalize_columns(quality_df)
     
     # Find columns
-    ra_col = next((c for c in quality_df.columns if 'ra' in c.lower() and 'name' in c.lower()), None)
-    issue_col = next((c for c in quality_df.columns if 'issue' in c.lower() and 'desc' in c.lower()), None)
+    cols = list(quality_df.columns)
+    ra_col = find_col(cols, 'ra', 'name')
+    issue_col = find_col(cols, 'issue', 'desc')
     
     if not ra_col:
         st.warning("Could not find RA column in quality data")
         return
     
+    # A handful of RAs across many rows: as a categorical, the filter below compares
+    # small integer codes and the option list comes straight from the categories
+    if not isinstance(quality_df[ra_col].dtype, pd.CategoricalDtype):
+        quality_df = quality_df.assign(**{ra_col: quality_df[ra_col].astype('category')})
+    
     # RA Filter
-    all_ras = ['All RAs'] + sorted(quality_df[ra_col].dropna().unique().tolist())
+    all_ras = ['All RAs'] + sorted(quality_df[ra_col].cat.categories.tolist())
     selected_ra = st.selectbox("🔎 Filter by RA", all_ras, key="quality_ra_filter")
     
+    # Compare category codes rather than strings; no copy needed since columns are
+    # only ever added via assign below
     if selected_ra != 'All RAs':
-        filtered_df = quality_df[quality_df[ra_col] == selected_ra].copy()
+        ra_codes = quality_df[ra_col].cat.codes
+        filtered_df = quality_df.loc[ra_codes == quality_df[ra_col].cat.categories.get_loc(selected_ra)]
     else:
-        filtered_df = quality_df.copy()
+        filtered_df = quality_df
     
     st.markdown(f"**Total Issues Found:** {len(filtered_df)}")
     
@@ -1293,88 +1473,48 @@ def render_quality_issues(quality_df: pd.DataFrame, month_name: str):
         st.success("✅ No quality issues for this selection!")
         return
     
-    # Extract issue categories by pattern matching
+    # Extract issue categories by pattern matching; counted once and reused by every chart below
+    category_counts = None
     if issue_col:
-        def categorize_issue(desc):
-            desc_lower = str(desc).lower()
-            if 'not linked' in desc_lower or 'unlinked' in desc_lower or 'linking' in desc_lower:
-                return 'Unlinked Transactions'
-            elif 'imbalance' in desc_lower or 'source' in desc_lower and 'use' in desc_lower:
-                return 'Sources/Uses Imbalance'
-            elif 'cash on hand' in desc_lower or 'cash-on-hand' in desc_lower:
-                return 'Cash Balance Missing'
-            elif 'in-kind' in desc_lower or 'in kind' in desc_lower:
-                return 'In-Kind Recording Issues'
-            elif '21 days' in desc_lower or 'old' in desc_lower:
-                return 'Outdated Transactions'
-            elif 'medicine' in desc_lower or 'health' in desc_lower:
-                return 'Health Record Issues'
-            elif 'pregnancy' in desc_lower:
-                return 'Pregnancy Tracking Issues'
-            elif 'update' in desc_lower or 'form' in desc_lower:
-                return 'Missing Forms/Updates'
-            elif 'mpesa' in desc_lower or 'm-pesa' in desc_lower:
-                return 'Unlinked Transactions'
-            elif 'credit' in desc_lower or 'shop' in desc_lower:
-                return 'Unlinked Transactions'
-            else:
-                return 'Other Data Issues'
-        
-        filtered_df['issue_category'] = filtered_df[issue_col].apply(categorize_issue)
+        filtered_df = filtered_df.assign(issue_category=categorize_issues(filtered_df[issue_col]))
+        category_counts = count_issue_categories(filtered_df['issue_category'])
     
     col1, col2 = st.columns(2)
     
     with col1:
         # Issue Categories Chart
         st.markdown("### 📊 Issues by Category")
-        if 'issue_category' in filtered_df.columns:
-            category_counts = filtered_df['issue_category'].value_counts().reset_index()
-            category_counts.columns = ['Category', 'Count']
-            
-            fig = px.bar(category_counts, x='Count', y='Category', orientation='h',
-                        color='Count', color_continuous_scale='Reds')
-            fig.update_layout(
-                height=350, showlegend=False, coloraxis_showscale=False,
-                yaxis={'categoryorder':'total ascending'},
-                xaxis_title="Number of Issues", yaxis_title=""
-            )
+        if category_counts is not None:
+            fig = build_issue_category_chart(frame_hash(category_counts), category_counts)
             st.plotly_chart(fig, use_container_width=True)
     
     with col2:
         # Issues by RA (if showing all) or pie chart (if specific RA)
         if selected_ra == 'All RAs':
             st.markdown("### 👤 Issues per RA")
-            ra_counts = filtered_df[ra_col].value_counts().reset_index()
-            ra_counts.columns = ['RA', 'Issue Count']
-            ra_counts['RA'] = ra_counts['RA'].str.title()
+            ra_counts = filtered_df.groupby(ra_col, observed=True).size()
+            ra_counts = pd.DataFrame({'RA': ra_counts.index.astype(str).str.title(),
+                                      'Issue Count': ra_counts.to_numpy()})
             ra_counts = ra_counts.sort_values('Issue Count', ascending=True)
             
-            fig = px.bar(ra_counts, x='Issue Count', y='RA', orientation='h',
-                        color='Issue Count', color_continuous_scale='RdYlGn_r')
-            fig.update_layout(height=350, showlegend=False, coloraxis_showscale=False,
-                            xaxis_title="Number of Issues", yaxis_title="")
+            fig = build_ra_issue_chart(frame_hash(ra_counts), ra_counts)
             st.plotly_chart(fig, use_container_width=True)
         else:
             st.markdown("### 📋 Category Breakdown")
-            if 'issue_category' in filtered_df.columns:
-                category_counts = filtered_df['issue_category'].value_counts().reset_index()
-                category_counts.columns = ['Category', 'Count']
-                
-                fig = px.pie(category_counts, values='Count', names='Category', 
-                           color_discrete_sequence=px.colors.qualitative.Set3)
-                fig.update_layout(height=350)
+            if category_counts is not None:
+                fig = build_issue_category_pie(frame_hash(category_counts), category_counts)
                 st.plotly_chart(fig, use_container_width=True)
     
     # Key Quality Areas (simpler than training recommendations)
     st.markdown("### 🎯 Key Quality Areas to Improve")
     
-    if 'issue_category' in filtered_df.columns:
-        top_categories = filtered_df['issue_category'].value_counts().head(3)
+    if category_counts is not None:
+        top_categories = category_counts.head(3)
         
         cols = st.columns(min(3, len(top_categories)))
         icons = ['1️⃣', '2️⃣', '3️⃣']
         
-        for i, (cat, count) in enumerate(top_categories.items()):
+        for i, (cat, count) in enumerate(zip(top_categories['Category'], top_categories['Count'])):
             if i < len(cols):
                 with cols[i]:
                     pct = round(count / len(filtered_df) * 100)
@@ -1422,6 +1562,12 @@ def render_admin_section(df: pd.DataFrame, manual_scores: dict, month_key: str,
     
     st.divider()
     
+    render_manual_score_entry(df, manual_scores, month_key)
+
+
+@st.fragment
+def render_manual_score_entry(df: pd.DataFrame, manual_scores: dict, month_key: str):
+    """Manual score widgets, rerun as a fragment so edits don't rebuild the whole page."""
     # Reset button
     col1, col2 = st.columns([3, 1])
     with col1:
@@ -1435,80 +1581,66 @@ def render_admin_section(df: pd.DataFrame, manual_scores: dict, month_key: str,
                 st.rerun()
     
     month_scores = manual_scores.get(month_key, {})
-    updated = False
+    updates = {}
     
-    for _, row in df.iterrows():
-        ra_name = str(row['ra_name']) if 'ra_name' in row else 'Unknown'
-        ra_scores = month_scores.get(ra_name, {})
-        
-        st.markdown(f"#### {ra_name.title()}")
-        cols = st.columns(3)
-        
-        # Score options with descriptions
-        journal_options = {
-            0: "0 - Not Rated",
-            1: "1 - Missing/Very Little",
-            2: "2 - Not Good",
-            3: "3 - Basic Minimum",
-            4: "4 - Good",
-            5: "5 - Outstanding"
-        }
-        
-        feedback_options = {
-            0: "0 - Not Rated",
-            1: "1 - Very Poor",
-            2: "2 - Low Effort",
-            3: "3 - Some Effort",
-            4: "4 - Most Checks Done",
-            5: "5 - All Checks Done"
-        }
-        
-        team_options = {
-            0: "0 - Not Rated",
-            1: "1 - Very Poor",
-            2: "2 - Minimal",
-            3: "3 - Some Contribution",
-            4: "4 - Good Contribution",
-            5: "5 - Led Discussion/Active"
-        }
-        
-        with cols[0]:
-            journal_val = st.selectbox(
-                "Journal Quality", 
-                list(journal_options.keys()),
-                format_func=lambda x: journal_options[x],
-                index=ra_scores.get('journal', 0), 
-                key=f"j_{ra_name}"
-            )
-        with cols[1]:
-            feedback_val = st.selectbox(
-                "Feedback Response", 
-                list(feedback_options.keys()),
-                format_func=lambda x: feedback_options[x],
-                index=ra_scores.get('feedback', 0), 
-                key=f"f_{ra_name}"
-            )
-        with cols[2]:
-            team_val = st.selectbox(
-                "Team Contribution", 
-                list(team_options.keys()),
-                format_func=lambda x: team_options[x],
-                index=ra_scores.get('team', 0), 
-                key=f"t_{ra_name}"
-            )
+    # Widgets inside a form don't trigger reruns; everything is saved in one write on submit
+    with st.form("admin_scores"):
+        for ra_name, ra_title in zip(df['ra_name'].astype(str).tolist(), df['ra_name_title'].tolist()):
+            ra_scores = month_scores.get(ra_name, {})
+            
+            st.markdown(f"#### {ra_title}")
+            cols = st.columns(3)
+            
+            with cols[0]:
+                journal_val = st.selectbox(
+                    "Journal Quality", 
+                    SCORE_VALUES,
+                    format_func=JOURNAL_SCORE_OPTIONS.get,
+                    index=ra_scores.get('journal', 0), 
+                    key=f"j_{ra_name}"
+                )
+            with cols[1]:
+                feedback_val = st.selectbox(
+                    "Feedback Response", 
+                    SCORE_VALUES,
+                    format_func=FEEDBACK_SCORE_OPTIONS.get,
+                    index=ra_scores.get('feedback', 0), 
+                    key=f"f_{ra_name}"
+                )
+            with cols[2]:
+                team_val = st.selectbox(
+                    "Team Contribution", 
+                    SCORE_VALUES,
+                    format_func=TEAM_SCORE_OPTIONS.get,
+                    index=ra_scores.get('team', 0), 
+                    key=f"t_{ra_name}"
+                )
+            
+            updates[ra_name] = {'journal': journal_val, 'feedback': feedback_val, 'team': team_val}
+            st.divider()
         
-        new_scores = {'journal': journal_val, 'feedback': feedback_val, 'team': team_val}
-        if new_scores != ra_scores:
-            if month_key not in manual_scores:
-                manual_scores[month_key] = {}
-            manual_scores[month_key][ra_name] = new_scores
-            updated = True
-        st.divider()
+        submitted = st.form_submit_button("💾 Save Scores", type="primary", use_container_width=True)
     
-    if updated:
-        save_manual_scores(manual_scores)
+    if st.session_state.pop('manual_scores_saved', False):
         st.success("Scores saved!")
-        st.rerun()
+    
+    if submitted:
+        changed = {ra: s for ra, s in updates.items() if s != month_scores.get(ra)}
+        if changed:
+            manual_scores.setdefault(month_key, {}).update(changed)
+            save_manual_scores(manual_scores)
+            # Rerun the whole app (not just this fragment) so the leaderboard, charts and
+            # download pick up the new totals; the flag carries the message across the rerun
+            st.session_state['manual_scores_saved'] = True
+            st.rerun()
+        else:
+            st.info("No score changes to save.")
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def leaderboard_csv_bytes(df_hash: int, _df: pd.DataFrame) -> bytes:
+    """Serialize the leaderboard as CSV bytes for the download button."""
+    return _df.drop(columns=['ra_name_title'], errors='ignore').to_csv(index=False).encode('utf-8')
 
 
 # --------------------------------------------------------------------
@@ -1577,6 +1709,9 @@ def main():
                 if not db_available_now:
                     st.error("❌ Database not reachable. Please ensure MySQL is running on localhost:3306.")
                 else:
+                    # An explicit refresh must hit the database; the cache only spares
+                    # re-running the quality script for the issues tab below
+                    _query_sql_file.clear()
                     with st.spinner("Running SQL scripts..."):
                         df = fetch_all_metrics(start_date, end_date)
                         if not df.empty:
@@ -1626,7 +1761,7 @@ def main():
         quality_df = load_cached_quality(month_key)
     
     if df.empty:
-        st.markdown(f'<div class="header-container"><h1>🏆 RA Performance Dashboard</h1><p>| {month_name}</p></div>', unsafe_allow_html=True)
+        st.markdown(HEADER_HTML.format(month_name=month_name), unsafe_allow_html=True)
         
         # Provide context-aware message for empty data
         selected_date = datetime(year, month, 1)
@@ -1648,7 +1783,7 @@ def main():
         df = calculate_scores(df)
     df = combine_scores(df, manual_scores, month_key)
     
-    st.markdown(f'<div class="header-container"><h1>🏆 RA Performance Dashboard</h1><p>| {month_name}</p></div>', unsafe_allow_html=True)
+    st.markdown(HEADER_HTML.format(month_name=month_name), unsafe_allow_html=True)
     
     tab1, tab2, tab3, tab4, tab5 = st.tabs([
         "📊 Data Summary", 
@@ -1670,7 +1805,7 @@ def main():
         render_admin_section(df, manual_scores, month_key, is_admin)
     
     st.divider()
-    st.download_button("📥 Download CSV", df.to_csv(index=False), "ra_leaderboard.csv", "text/csv", use_container_width=True)
+    st.download_button("📥 Download CSV", leaderboard_csv_bytes(frame_hash(df), df), "ra_leaderboard.csv", "text/csv", use_container_width=True)
 
 
 if __name__ == "__main__":
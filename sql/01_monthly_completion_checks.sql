@@ -52,6 +52,22 @@ base_interviews AS (
       AND h.name NOT LIKE '%KTEST%'
 ),
 
+-- ------------------------------------------------------------
+-- Previous interview per household (full history, not just window)
+-- One sorted pass with LAG() instead of a MAX() subquery per row
+-- ------------------------------------------------------------
+prev_interviews AS (
+    SELECT
+        i.id AS interview_id,
+        LAG(i.interview_start_date) OVER (
+            PARTITION BY i.household_id
+            ORDER BY i.interview_start_date
+        ) AS prev_interview_date
+    FROM interviews i
+    WHERE i.status = 1
+      AND i.household_id IN (SELECT hh_id FROM base_interviews)
+),
+
 -- ------------------------------------------------------------
 -- 1. GOINGS-ON CHECK
 -- ------------------------------------------------------------
@@ -103,6 +119,23 @@ goingson_check AS (
     GROUP BY i.interview_id
 ),
 
+-- ------------------------------------------------------------
+-- Member status dates, aggregated once per member instead of
+-- re-scanning `status` for every interview/member pair
+-- ------------------------------------------------------------
+member_status AS (
+    SELECT
+        s.entity_id AS member_id,
+        MIN(s.status_date) AS first_status_date,
+        MIN(CASE WHEN s.type = 2 THEN s.status_date END) AS first_out_date   -- out-of-household
+    FROM status s
+    JOIN members m 
+      ON m.id = s.entity_id
+    WHERE s.entity_type = 51
+      AND m.household_id IN (SELECT hh_id FROM base_interviews)
+    GROUP BY s.entity_id
+),
+
 -- ------------------------------------------------------------
 -- 2. WELL-BEING CHECK (member-level, includes non-roster adults)
 -- ------------------------------------------------------------
@@ -123,23 +156,8 @@ wellbeing_member_check AS (
         AND m.id <> 363175609956200000             -- manual exclusion
         -- adults only at interview date
         AND FLOOR(DATEDIFF(i.interview_start_date, m.birthdate) / 365.25) >= 18
-        -- exclude members who are OUT on/before interview date
-        AND NOT EXISTS (
-            SELECT 1
-            FROM status s
-            WHERE s.entity_type = 51
-              AND s.entity_id   = m.id
-              AND s.type        = 2           -- out-of-household
-              AND s.status_date <= DATE(i.interview_start_date)
-        )
-        -- exclude members who joined AFTER the interview date
-        AND COALESCE(
-                (SELECT MIN(s_join.status_date)
-                 FROM status s_join
-                 WHERE s_join.entity_id = m.id
-                   AND s_join.entity_type = 51),
-                DATE('1900-01-01')             -- if no status record, assume in HH
-            ) <= DATE(i.interview_start_date)
+    LEFT JOIN member_status ms
+        ON ms.member_id = m.id
     LEFT JOIN answers a 
         ON a.interview_id = i.interview_id 
        AND a.question_id IN (590727, 590730, 590733, 590736)
@@ -147,6 +165,11 @@ wellbeing_member_check AS (
             a.member_id = m.id 
             OR (a.entity_id = m.id AND a.entity_type = 51)
        )
+    -- exclude members who are OUT on/before interview date
+    WHERE (ms.first_out_date IS NULL OR ms.first_out_date > DATE(i.interview_start_date))
+      -- exclude members who joined AFTER the interview date
+      -- (if no status record, assume in HH)
+      AND COALESCE(ms.first_status_date, DATE('1900-01-01')) <= DATE(i.interview_start_date)
     GROUP BY i.interview_id, m.id, m.person_code, m.name
 ),
 
@@ -290,14 +313,10 @@ hi_update_check AS (
                                         AS days_since_open,
             DATEDIFF(DATE(i.interview_start_date), ei.close_date)
                                         AS days_since_close,
-            (
-                SELECT MAX(i2.interview_start_date)
-                FROM interviews i2
-                WHERE i2.household_id = i.hh_id
-                  AND i2.status = 1
-                  AND i2.interview_start_date < i.interview_start_date
-            ) AS prev_interview_date
+            pi.prev_interview_date
         FROM base_interviews i
+        LEFT JOIN prev_interviews pi
+              ON pi.interview_id = i.interview_id
         JOIN entity_items ei
               ON ei.household_id = i.hh_id
              AND ei.status = 1
@@ -334,20 +353,8 @@ hi_update_check AS (
                 OR DATEDIFF(DATE(i.interview_start_date), ei.close_date) <= 14
               )
           AND NOT (
-                (
-                    SELECT MAX(i2.interview_start_date)
-                    FROM interviews i2
-                    WHERE i2.household_id = i.hh_id
-                      AND i2.status = 1
-                      AND i2.interview_start_date < i.interview_start_date
-                ) IS NOT NULL
-                AND ei.open_date >= (
-                    SELECT MAX(i2.interview_start_date)
-                    FROM interviews i2
-                    WHERE i2.household_id = i.hh_id
-                      AND i2.status = 1
-                      AND i2.interview_start_date < i.interview_start_date
-                )
+                pi.prev_interview_date IS NOT NULL
+                AND ei.open_date >= pi.prev_interview_date
                 AND ei.close_date IS NOT NULL
                 AND DATE(ei.close_date) <= DATE(i.interview_start_date)
           )
@@ -500,48 +507,50 @@ journal_check AS (
 ),
 
 -- ------------------------------------------------------------
--- 9. CASHFLOW MISSING CHECK (unchanged)
+-- 9/10. CASHFLOW MISSING + FEW CASHFLOWS CHECKS
+--       (one pass over cashflows, both flags derived from the count)
 -- ------------------------------------------------------------
-cashflow_missing_check AS (
+cashflow_counts AS (
     SELECT
         i.interview_id,
+        i.household_code,
+        COUNT(cf.id) AS total_cashflows
+    FROM base_interviews i
+    LEFT JOIN cashflows cf 
+           ON cf.interview_id = i.interview_id 
+          AND cf.status      = 1
+    GROUP BY i.interview_id, i.household_code
+),
+
+cashflow_missing_check AS (
+    SELECT
+        interview_id,
         CASE 
-            WHEN COUNT(cf.id) = 0 THEN 1 
+            WHEN total_cashflows = 0 THEN 1 
             ELSE 0 
         END AS cashflow_missing_flag,
         CASE 
-            WHEN COUNT(cf.id) = 0 THEN 'No cashflows recorded' 
+            WHEN total_cashflows = 0 THEN 'No cashflows recorded' 
             ELSE '' 
         END AS cashflow_missing_detail
-    FROM base_interviews i
-    LEFT JOIN cashflows cf 
-           ON cf.interview_id = i.interview_id 
-          AND cf.status      = 1
-    GROUP BY i.interview_id
+    FROM cashflow_counts
 ),
 
--- ------------------------------------------------------------
--- 10. FEW CASHFLOWS CHECK (unchanged)
--- ------------------------------------------------------------
 cashflow_few_check AS (
     SELECT
-        i.interview_id,
+        interview_id,
         CASE 
-            WHEN i.household_code IN ('KMURR18', 'KMURR10', 'KMURR12', 'KMURI30', 'KMURI35', 'KKWAL48') THEN 0
-            WHEN COUNT(cf.id) > 0 AND COUNT(cf.id) < 20 THEN 1 
+            WHEN household_code IN ('KMURR18', 'KMURR10', 'KMURR12', 'KMURI30', 'KMURI35', 'KKWAL48') THEN 0
+            WHEN total_cashflows BETWEEN 1 AND 19 THEN 1 
             ELSE 0 
         END AS cashflowfew_flag,
         CASE 
-            WHEN i.household_code IN ('KMURR18', 'KMURR10', 'KMURR12', 'KMURI30', 'KMURI35', 'KKWAL48') THEN ''
-            WHEN COUNT(cf.id) > 0 AND COUNT(cf.id) < 20 
-            THEN CONCAT('Only ', COUNT(cf.id), ' cashflows recorded')
+            WHEN household_code IN ('KMURR18', 'KMURR10', 'KMURR12', 'KMURI30', 'KMURI35', 'KKWAL48') THEN ''
+            WHEN total_cashflows BETWEEN 1 AND 19 
+            THEN CONCAT('Only ', total_cashflows, ' cashflows recorded')
             ELSE ''
         END AS cashflowfew_detail
-    FROM base_interviews i
-    LEFT JOIN cashflows cf 
-           ON cf.interview_id = i.interview_id 
-          AND cf.status      = 1
-    GROUP BY i.interview_id
+    FROM cashflow_counts
 ),
 
 -- ------------------------------------------------------------
@@ -1099,17 +1099,17 @@ cf18 AS (
     FROM cashflow_enriched cf
     JOIN base_interviews bi ON bi.interview_id = cf.interview_id
     LEFT JOIN primary_member pm ON pm.interview_id = bi.interview_id AND pm.rn = 1
-    -- Get previous interview for this household
+    -- Get previous interview for this household (LAG over the household's history)
     LEFT JOIN (
         SELECT 
             i.id AS interview_id,
-            DATE((SELECT MAX(i2.interview_start_date) 
-                  FROM interviews i2 
-                  WHERE i2.household_id = i.household_id 
-                    AND i2.interview_start_date < i.interview_start_date
-                    AND i2.status = 1)) AS prev_interview_date
+            DATE(LAG(i.interview_start_date) OVER (
+                PARTITION BY i.household_id
+                ORDER BY i.interview_start_date
+            )) AS prev_interview_date
         FROM interviews i
         WHERE i.status = 1
+          AND i.household_id IN (SELECT hh_id FROM base_interviews)
     ) prev ON prev.interview_id = bi.interview_id
     WHERE cf.is_balance = 0
       AND (
@@ -0,0 +1,39 @@
+import pandas as pd
+
+import app
+
+
+def test_count_issue_categories_keeps_first_seen_order_for_ties():
+    categories = pd.Series(['Outdated Transactions', 'Cash Balance Missing', 'Unlinked Transactions',
+                            'Cash Balance Missing', 'Outdated Transactions', 'Unlinked Transactions',
+                            'Unlinked Transactions'], name='issue_category')
+
+    counts = app.count_issue_categories(categories)
+
+    assert counts.columns.tolist() == ['Category', 'Count']
+    assert counts['Category'].tolist() == ['Unlinked Transactions', 'Outdated Transactions', 'Cash Balance Missing']
+    assert counts['Count'].tolist() == [3, 2, 2]
+    assert counts['Category'].tolist() == categories.value_counts().index.tolist()
+
+
+def test_load_cached_data_reads_blank_legacy_csv_score_as_zero(tmp_path, monkeypatch):
+    monkeypatch.setattr(app, 'DATA_DIR', tmp_path)
+    (tmp_path / 'cached_leaderboard_2025_10.csv').write_text(
+        "ra_name,pct_complete,schedule_score,quality_score,completion_score\n"
+        "abi,83,1,,4\n"
+        "ann,100,,2,5\n"
+    )
+
+    df = app.load_cached_data('2025_10')
+
+    assert df['ra_name'].tolist() == ['abi', 'ann']
+    assert df['schedule_score'].tolist() == [1, 0]
+    assert df['quality_score'].tolist() == [0, 2]
+    assert df['completion_score'].tolist() == [4, 5]
+    assert (df[['schedule_score', 'quality_score', 'completion_score']].dtypes == 'int8').all()
+
+
+def test_load_cached_data_missing_month_is_empty(tmp_path, monkeypatch):
+    monkeypatch.setattr(app, 'DATA_DIR', tmp_path)
+
+    assert app.load_cached_data('2025_09').empty